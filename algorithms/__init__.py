@@ -3,21 +3,53 @@ Algorithms package for FSJP (Flexible Shop Job Problem) solvers.
 This package contains various algorithms for solving FSJP instances.
 """
 
+from functools import lru_cache
 from importlib import import_module
-import os
 import json
+import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parsed config.json, populated on first call to get_config()
+_CONFIG = None
+
+
+def get_config():
+    """
+    Get the configuration from config.json.
+    
+    The file is read and parsed once per process; later calls return the
+    same dictionary.
+    
+    Returns:
+        dict: Configuration dictionary
+    """
+    global _CONFIG
+    if _CONFIG is None:
+        if orjson is not None:
+            with open('config.json', 'rb') as f:
+                _CONFIG = orjson.loads(f.read())
+        else:
+            with open('config.json', 'r') as f:
+                _CONFIG = json.loads(f.read())
+    return _CONFIG
+
+
+@lru_cache(maxsize=1)
 def load_algorithms():
     """
     Load all enabled algorithms from config.json.
     
+    The result is cached, so the config is read and the modules are
+    imported only once per process.
+    
     Returns:
         dict: Dictionary of algorithm name to algorithm function
     """
-    # Load configuration
-    with open('config.json', 'r') as f:
-        config = json.load(f)
-    
+    config = get_config()
     algorithms = {}
     
     # Get enabled algorithms from config
@@ -52,9 +84,7 @@ def run_algorithm(name, instance):
     Returns:
         dict: Result of the algorithm containing at least 'makespan' and 'schedule'
     """
-    import time
-    
-    # Load algorithms
+    # Load algorithms (cached after the first call)
     algorithms = load_algorithms()
     
     if name not in algorithms:
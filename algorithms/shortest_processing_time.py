@@ -2,81 +2,276 @@
 Shortest Processing Time (SPT) algorithm for the FSJP.
 """
 
-def shortest_processing_time(instance):
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _flatten_instance(instance):
     """
-    A greedy algorithm for FSJP using the Shortest Processing Time heuristic.
-    At each step, schedules the operation with the shortest processing time
-    on its best eligible machine.
+    Flatten an instance into dense NumPy arrays (one row per job).
     
     Args:
-        instance: FSJPInstance to schedule
+        instance: FSJPInstance to flatten
         
     Returns:
-        dict: Dictionary containing the makespan and schedule
+        tuple: (op_machines, op_proc_time, op_counts) where
+               op_machines[j, k, i] is the i-th eligible machine of operation k
+               of job j (-1 if absent), op_proc_time[j, k] is the processing
+               time of that operation (+inf if absent) and op_counts[j] is the
+               number of operations of job j
     """
+    num_jobs = instance.num_jobs
+    job_ops = [job['operations'] for job in instance.jobs]
+    op_counts = instance.op_counts
+    max_ops = int(op_counts.max()) if num_jobs else 0
+    max_flex = max((len(op['eligible_machines']) for ops in job_ops for op in ops), default=0)
+    
+    op_machines = np.full((num_jobs, max_ops, max_flex), -1, dtype=np.int32)
+    op_proc_time = np.full((num_jobs, max_ops), np.inf)
+    
+    for job_id, ops in enumerate(job_ops):
+        machines_row = op_machines[job_id]
+        proc_row = op_proc_time[job_id]
+        for op_idx, operation in enumerate(ops):
+            machines = operation['eligible_machines']
+            machines_row[op_idx, :len(machines)] = machines
+            proc_row[op_idx] = operation['processing_time']
+    
+    return op_machines, op_proc_time, op_counts
+
+
+def _spt_core(op_machines, op_proc_time, op_counts, num_machines):
+    """
+    Run the SPT scheduling loop on flattened instance arrays.
+    
+    Plain scalar loop over the arrays from _flatten_instance, compiled with
+    Numba when it is installed.
+    
+    Returns:
+        tuple: (sched_job, sched_op, sched_machine, sched_start,
+               sched_completion, makespan) with one entry per scheduled
+               operation, in scheduling order
+    """
+    num_jobs = op_counts.shape[0]
+    max_flex = op_machines.shape[2]
+    total_ops = op_counts.sum()
+    
     # Machine availability times
-    machine_available = [0] * instance.num_machines
+    machine_available = np.zeros(num_machines)
     
     # Job completion tracking
-    job_operation_idx = [0] * instance.num_jobs
-    job_completion = [0] * instance.num_jobs
+    job_operation_idx = np.zeros(num_jobs, dtype=np.int64)
+    job_completion = np.zeros(num_jobs)
     
-    # Schedule operations until all jobs are complete
-    schedule = []
+    # Jobs with operations left to schedule, kept in job order so ties are
+    # broken the same way as a scan over all jobs
+    active_jobs = np.empty(num_jobs, dtype=np.int64)
+    num_active = 0
+    for job_id in range(num_jobs):
+        if op_counts[job_id] > 0:
+            active_jobs[num_active] = job_id
+            num_active += 1
     
-    while not all(job_operation_idx[j] >= len(instance.jobs[j]['operations']) 
-                 for j in range(instance.num_jobs)):
-        
-        # Find next operation to schedule using SPT
-        best_processing_time = float('inf')
+    # Scheduled operations, in scheduling order
+    sched_job = np.empty(total_ops, dtype=np.int64)
+    sched_op = np.empty(total_ops, dtype=np.int64)
+    sched_machine = np.empty(total_ops, dtype=np.int64)
+    sched_start = np.empty(total_ops)
+    sched_completion = np.empty(total_ops)
+    
+    # Every step schedules exactly one operation
+    for step in range(total_ops):
+        best_processing_time = np.inf
+        best_start_time = np.inf
+        best_pos = -1
         best_job = -1
         best_machine = -1
-        best_start_time = float('inf')
         
-        for job_id in range(instance.num_jobs):
-            # Skip if job is complete
-            if job_operation_idx[job_id] >= len(instance.jobs[job_id]['operations']):
-                continue
+        for pos in range(num_active):
+            job_id = active_jobs[pos]
+            op_idx = job_operation_idx[job_id]
             
-            # Get the next operation for this job
-            operation = instance.jobs[job_id]['operations'][job_operation_idx[job_id]]
+            # The processing time is the same on every eligible machine, so a
+            # slower operation can be skipped without looking at its machines
+            processing_time = op_proc_time[job_id, op_idx]
+            if processing_time > best_processing_time:
+                continue
+            job_ready = job_completion[job_id]
             
-            # Find the machine with the shortest processing time for this operation
-            for machine in operation['eligible_machines']:
-                processing_time = operation['processing_times'][machine]
-                start_time = max(machine_available[machine], job_completion[job_id])
+            for i in range(max_flex):
+                machine = op_machines[job_id, op_idx, i]
+                if machine < 0:
+                    break
+                machine_ready = machine_available[machine]
+                start_time = machine_ready if machine_ready > job_ready else job_ready
                 
                 # Prioritize by processing time, then by start time
-                if (processing_time < best_processing_time or 
-                    (processing_time == best_processing_time and start_time < best_start_time)):
+                # (processing_time <= best_processing_time here)
+                if processing_time < best_processing_time or start_time < best_start_time:
                     best_processing_time = processing_time
                     best_start_time = start_time
+                    best_pos = pos
                     best_job = job_id
                     best_machine = machine
-                    best_completion_time = start_time + processing_time
         
-        # Schedule the best operation
-        if best_job != -1:
-            operation = instance.jobs[best_job]['operations'][job_operation_idx[best_job]]
-            
-            schedule.append({
-                'job_id': best_job,
-                'operation_id': operation['operation_id'],
-                'machine': best_machine,
-                'start_time': best_start_time,
-                'completion_time': best_completion_time
-            })
-            
-            # Update state
-            machine_available[best_machine] = best_completion_time
-            job_completion[best_job] = best_completion_time
-            job_operation_idx[best_job] += 1
+        best_completion_time = best_start_time + best_processing_time
+        
+        sched_job[step] = best_job
+        sched_op[step] = job_operation_idx[best_job]
+        sched_machine[step] = best_machine
+        sched_start[step] = best_start_time
+        sched_completion[step] = best_completion_time
+        
+        # Update state
+        machine_available[best_machine] = best_completion_time
+        job_completion[best_job] = best_completion_time
+        job_operation_idx[best_job] += 1
+        
+        # Drop the job from the active list once its last operation is scheduled
+        if job_operation_idx[best_job] == op_counts[best_job]:
+            for pos in range(best_pos, num_active - 1):
+                active_jobs[pos] = active_jobs[pos + 1]
+            num_active -= 1
+    
+    return (sched_job, sched_op, sched_machine, sched_start, sched_completion,
+            job_completion.max())
+
+
+def _spt_numpy(op_machines, op_proc_time, op_counts, num_machines):
+    """
+    Batched NumPy equivalent of _spt_core, used when Numba is not installed.
+    
+    Each step evaluates every (job, machine) candidate at once instead of
+    scanning them in a Python loop. The handful of NumPy calls per step only
+    pays off on larger instances (see _spt_fallback).
+    """
+    num_jobs = op_counts.shape[0]
+    total_ops = int(op_counts.sum())
+    
+    # Jobs with operations left to schedule, in job order
+    jobs = np.flatnonzero(op_counts)
+    
+    # When every operation has the same flexibility (e.g. a fixed
+    # flexibility range) there are no padded machine slots to mask out
+    real_ops = np.arange(op_machines.shape[1]) < op_counts[:, None]
+    padded = bool((op_machines[real_ops] < 0).any())
+    
+    # Machine availability times
+    machine_available = np.zeros(num_machines)
+    
+    # Job completion tracking
+    job_operation_idx = np.zeros(num_jobs, dtype=np.int64)
+    job_completion = np.zeros(num_jobs)
+    
+    # Scheduled operations, in scheduling order
+    sched_job = np.empty(total_ops, dtype=np.int64)
+    sched_op = np.empty(total_ops, dtype=np.int64)
+    sched_machine = np.empty(total_ops, dtype=np.int64)
+    sched_start = np.empty(total_ops)
+    sched_completion = np.empty(total_ops)
+    
+    # Every step schedules exactly one operation
+    for step in range(total_ops):
+        # Candidate (job, machine) pairs for the next operation of every job
+        job_op_idx = job_operation_idx[jobs]
+        machines = op_machines[jobs, job_op_idx]
+        processing_times = op_proc_time[jobs, job_op_idx]
+        start_times = np.maximum(machine_available[machines], job_completion[jobs, None])
+        
+        # Prioritize by processing time, then by start time. argmin returns
+        # the first minimum in (job, machine) order, matching _spt_core.
+        best_processing_time = processing_times.min()
+        if padded:
+            start_times[machines < 0] = np.inf
+        start_times[processing_times != best_processing_time] = np.inf
+        best_row, best_slot = divmod(int(start_times.argmin()), machines.shape[1])
+        
+        best_job = jobs[best_row]
+        best_machine = machines[best_row, best_slot]
+        best_start_time = start_times[best_row, best_slot]
+        best_completion_time = best_start_time + best_processing_time
+        
+        sched_job[step] = best_job
+        sched_op[step] = job_operation_idx[best_job]
+        sched_machine[step] = best_machine
+        sched_start[step] = best_start_time
+        sched_completion[step] = best_completion_time
+        
+        # Update state
+        machine_available[best_machine] = best_completion_time
+        job_completion[best_job] = best_completion_time
+        job_operation_idx[best_job] += 1
+        
+        # Drop the job from the candidates once its last operation is scheduled
+        if job_operation_idx[best_job] == op_counts[best_job]:
+            jobs = np.delete(jobs, best_row)
+    
+    return (sched_job, sched_op, sched_machine, sched_start, sched_completion,
+            job_completion.max())
+
+
+# Below this many jobs the per-step call overhead of _spt_numpy outweighs
+# its batching, and the plain scalar loop is faster
+_NUMPY_MIN_JOBS = 15
+
+
+def _spt_fallback(op_machines, op_proc_time, op_counts, num_machines):
+    """Run whichever uncompiled SPT loop is faster for the instance size."""
+    if op_counts.shape[0] < _NUMPY_MIN_JOBS:
+        return _spt_core(op_machines, op_proc_time, op_counts, num_machines)
+    return _spt_numpy(op_machines, op_proc_time, op_counts, num_machines)
+
+
+# Use the compiled scalar loop when Numba is available (cache=True keeps the
+# compiled code on disk, so later runs skip the JIT step). The explicit
+# signature makes Numba compile, or load from the cache, when this module is
+# imported rather than on the first (timed) call.
+if njit is not None:
+    _schedule_arrays = njit('(int32[:, :, ::1], float64[:, ::1], int32[::1], int64)',
+                            cache=True)(_spt_core)
+else:
+    _schedule_arrays = _spt_fallback
+
+
+def shortest_processing_time(instance):
+    """
+    A greedy algorithm for FSJP using the Shortest Processing Time heuristic.
+    At each step, schedules the operation with the shortest processing time
+    on its best eligible machine.
+    
+    Args:
+        instance: FSJPInstance to schedule
+        
+    Returns:
+        dict: Dictionary containing the makespan and schedule
+    """
+    op_machines, op_proc_time, op_counts = _flatten_instance(instance)
+    
+    (sched_job, sched_op, sched_machine, sched_start, sched_completion,
+     makespan) = _schedule_arrays(op_machines, op_proc_time, op_counts,
+                                  instance.num_machines)
     
-    # Calculate makespan (maximum completion time)
-    makespan = max(job_completion)
+    # Build the schedule from the arrays
+    jobs = instance.jobs
+    schedule = [
+        {
+            'job_id': job_id,
+            'operation_id': jobs[job_id]['operations'][op_idx]['operation_id'],
+            'machine': machine,
+            'start_time': start_time,
+            'completion_time': completion_time
+        }
+        for job_id, op_idx, machine, start_time, completion_time in zip(
+            sched_job.tolist(), sched_op.tolist(), sched_machine.tolist(),
+            sched_start.tolist(), sched_completion.tolist())
+    ]
     
     return {
-        'makespan': makespan,
+        'makespan': float(makespan),
         'schedule': schedule,
         'algorithm_type': 'shortest_processing_time'
-    } 
\ No newline at end of file
+    }
@@ -4,18 +4,16 @@ This script generates problem instances and runs selected algorithms.
 """
 
 import random
-import time
-import json
 import numpy as np
 import os
-from utils import save_instance, load_instance, save_results, export_results_to_csv
-from algorithms import run_algorithm
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from algorithms import run_algorithm, get_config
 from results_manager import ResultsManager
-from visualize_results import generate_runtime_chart, generate_makespan_chart
 
 # Load configuration
-with open('config.json', 'r') as f:
-    CONFIG = json.load(f)
+CONFIG = get_config()
 
 class FSJPInstance:
     """Class representing a single FSJP instance."""
@@ -26,6 +24,9 @@ class FSJPInstance:
         random.seed(seed)
         np.random.seed(seed)
         
+        # Instance data is drawn from this generator
+        self._rng = np.random.default_rng(seed)
+        
         # Use values from config unless overridden
         self.num_jobs = num_jobs if num_jobs is not None else CONFIG['difficulty_parameters']['num_jobs']
         
@@ -35,42 +36,50 @@ class FSJPInstance:
         # Generate jobs
         self.jobs = self._generate_jobs()
         
+        # Number of operations per job, and in total
+        self.op_counts = np.fromiter((len(job['operations']) for job in self.jobs),
+                                     dtype=np.int32, count=self.num_jobs)
+        self.total_ops = int(self.op_counts.sum())
+        
     def _generate_jobs(self):
         """Generate a set of jobs with operations and machine assignments."""
+        rng = self._rng
+        ops_range = CONFIG['fixed_parameters']['operations_per_job']
+        flex_range = CONFIG['fixed_parameters']['flexibility']
+        
+        # Use operation_duration range if provided, otherwise use default range
+        duration_range = CONFIG['fixed_parameters'].get('operation_duration', [10, 100])
+        
+        # Determine number of operations for every job
+        num_ops_per_job = rng.integers(ops_range[0], ops_range[1] + 1, size=self.num_jobs)
+        total_ops = int(num_ops_per_job.sum())
+        
+        # Draw flexibility (number of machines that can process an operation)
+        # and processing time (same across all machines) for every operation
+        flexibilities = rng.integers(flex_range[0], min(flex_range[1], self.num_machines) + 1,
+                                     size=total_ops).tolist()
+        durations = rng.uniform(duration_range[0], duration_range[1], size=total_ops).tolist()
+        
         jobs = []
+        op_index = 0
         
-        for job_id in range(self.num_jobs):
-            # Determine number of operations for this job
-            ops_range = CONFIG['fixed_parameters']['operations_per_job']
-            num_operations = random.randint(ops_range[0], ops_range[1])
-            
+        for job_id, num_operations in enumerate(num_ops_per_job.tolist()):
             # Generate operations for this job
             operations = []
             for op_id in range(num_operations):
-                # Determine flexibility (number of machines that can process this operation)
-                flex_range = CONFIG['fixed_parameters']['flexibility']
-                flexibility = random.randint(flex_range[0], 
-                                           min(flex_range[1], self.num_machines))
-                
-                # Select which machines can process this operation
-                eligible_machines = random.sample(range(self.num_machines), flexibility)
-                
-                # Generate processing time for this operation (same across all machines)
-                # Use operation_duration range if provided, otherwise use default range
-                if 'operation_duration' in CONFIG['fixed_parameters']:
-                    duration_range = CONFIG['fixed_parameters']['operation_duration']
-                    processing_time = random.uniform(duration_range[0], duration_range[1])
-                else:
-                    processing_time = random.uniform(10, 100)
-                
-                # Create dictionary of processing times (same value for all eligible machines)
-                processing_times = {machine: processing_time for machine in eligible_machines}
+                # Select which machines can process this operation (kept as a
+                # sorted int32 array)
+                eligible_machines = np.sort(rng.choice(self.num_machines, size=flexibilities[op_index],
+                                                       replace=False).astype(np.int32))
                 
+                # Machines are homogeneous, so a single processing time applies
+                # to every eligible machine
                 operations.append({
                     'operation_id': op_id,
                     'eligible_machines': eligible_machines,
-                    'processing_times': processing_times
+                    'processing_time': durations[op_index]
                 })
+                op_index += 1
             
             jobs.append({
                 'job_id': job_id,
@@ -85,6 +94,48 @@ class FSJPInstance:
                 f"{self.num_jobs} jobs, {self.num_machines} machines")
 
 
+def _init_worker(enabled_algorithms):
+    """
+    Prepare a process before it runs any seeds.
+    
+    Imports the algorithms and runs each once on a throwaway instance of the
+    configured size (so it is valid for any configuration), so one-off
+    start-up costs (imports, JIT compilation) are not recorded as part of a
+    seed's execution time.
+    
+    Args:
+        enabled_algorithms: List of algorithm names to warm up
+    """
+    warmup_instance = FSJPInstance(seed=0)
+    for alg_name in enabled_algorithms:
+        run_algorithm(alg_name, warmup_instance)
+
+
+def _run_one_seed(seed, enabled_algorithms):
+    """
+    Generate the instance for one seed and run every enabled algorithm on it.
+    
+    Args:
+        seed: Random seed for the instance
+        enabled_algorithms: List of algorithm names to run
+        
+    Returns:
+        tuple: (seed, instance, results) where results maps algorithm name to
+               the algorithm's result
+    """
+    instance = FSJPInstance(seed=seed)
+    
+    seed_results = {}
+    for alg_name in enabled_algorithms:
+        result = run_algorithm(alg_name, instance)
+        
+        # Add seed to result
+        result['seed'] = seed
+        seed_results[alg_name] = result
+    
+    return seed, instance, seed_results
+
+
 def main():
     """Main function to run the FSJP experiments."""
     # Extract configuration parameters
@@ -95,12 +146,16 @@ def main():
     machine_exp = CONFIG['fixed_parameters']['machine_scaling_exponent']
     random_seed_base = CONFIG['experiment_parameters']['random_seed_base']
     test_name = CONFIG['experiment_parameters'].get('test_name', 'default_test')
+    # Seeds run one at a time unless configured otherwise, so timed runs do
+    # not compete for CPU
+    num_workers = CONFIG['experiment_parameters'].get('num_workers') or 1
     
     print(f"Starting FSJP experiments with {num_seeds} seeds")
     print(f"Test name: {test_name}")
     print(f"Number of jobs: {num_jobs}")
     print(f"Operations per job: {ops_range}, Flexibility: {flex_range}")
     print(f"Machine scaling exponent: {machine_exp}")
+    print(f"Worker processes: {num_workers}")
     
     # Get enabled algorithms
     enabled_algorithms = [alg for alg, enabled in CONFIG['algorithms'].items() if enabled]
@@ -113,29 +168,36 @@ def main():
     # Initialize results manager
     results_manager = ResultsManager(test_name)
     
-    for seed_idx in range(num_seeds):
-        seed = random_seed_base + seed_idx
-        print(f"\nRunning seed {seed_idx+1}/{num_seeds} (seed value: {seed})")
-        
-        # Generate problem instance
-        instance = FSJPInstance(seed=seed)
-        instances.append(instance)  # Store for validation
-        print(instance)
+    # Seeds are independent, so they can run in parallel. map() yields
+    # results in seed order, so instances and results line up as in a serial
+    # run.
+    seeds = [random_seed_base + seed_idx for seed_idx in range(num_seeds)]
+    run_seed = partial(_run_one_seed, enabled_algorithms=enabled_algorithms)
+    
+    with ExitStack() as stack:
+        if num_workers > 1:
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=num_workers, initializer=_init_worker,
+                initargs=(enabled_algorithms,)))
+            seed_runs = executor.map(run_seed, seeds)
+        else:
+            # A pool of one only adds process start-up and pickling, so run
+            # the seeds in this process
+            _init_worker(enabled_algorithms)
+            seed_runs = map(run_seed, seeds)
         
-        # Run enabled algorithms
-        for alg_name in enabled_algorithms:
-            print(f"  Running {alg_name}...", end="", flush=True)
-            result = run_algorithm(alg_name, instance)
+        for seed_idx, (seed, instance, seed_results) in enumerate(seed_runs):
+            print(f"\nSeed {seed_idx+1}/{num_seeds} (seed value: {seed})")
+            instances.append(instance)  # Store for validation
+            print(instance)
             
-            # Add seed to result
-            result['seed'] = seed
-            
-            print(f" Done. Makespan: {result['makespan']:.2f}, Time: {result['execution_time']:.4f}s")
-            
-            # Store result
-            if alg_name not in results:
-                results[alg_name] = []
-            results[alg_name].append(result)
+            for alg_name, result in seed_results.items():
+                print(f"  {alg_name}: Makespan: {result['makespan']:.2f}, Time: {result['execution_time']:.4f}s")
+                
+                # Store result
+                if alg_name not in results:
+                    results[alg_name] = []
+                results[alg_name].append(result)
     
     # Print summary
     print("\n" + "=" * 50)
@@ -183,21 +245,20 @@ def main():
         print(f"  - {saved_files[f'{alg_name}_solutions']} (solutions)")
         print(f"  - {saved_files[f'{alg_name}_validations']} (validations)")
     
-    # Generate visualization charts
+    # Generate visualization charts (imported here so matplotlib is only
+    # loaded once the experiments have finished)
     print("\nGenerating visualization charts...")
+    from visualize_results import generate_charts
     
-    # Load the saved results.json file
-    results_file = saved_files['results_summary']
-    with open(results_file, 'r') as f:
-        results_data = json.load(f)
+    # Use the summary just written to results.json rather than reading it back
+    results_data = results_manager.last_summary
     
     # Create output directory for charts
     charts_dir = os.path.join("results", test_name, "charts")
     os.makedirs(charts_dir, exist_ok=True)
     
     # Generate charts
-    generate_runtime_chart(results_data, charts_dir)
-    generate_makespan_chart(results_data, charts_dir)
+    generate_charts(results_data, charts_dir)
     
     print(f"Visualization charts saved to {charts_dir}")
 
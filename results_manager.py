@@ -3,12 +3,48 @@ Results management module for FSJP.
 Handles structured saving of experiment results.
 """
 
+import csv
 import os
-import json
-import pandas as pd
 from datetime import datetime
-from utils import validate_solution, NumpyEncoder
-import numpy as np
+from utils import validate_solution, write_json
+
+
+def _summary_stats(values):
+    """
+    Compute mean, population standard deviation, min and max.
+    
+    Failed runs report an infinite makespan, so values may be infinite. The
+    mean is taken as sum / count, which is then infinite as well. The
+    variance uses Welford's algorithm in one pass with the min and max, and,
+    like np.std, yields nan rather than failing in that case.
+    
+    Args:
+        values: Non-empty list of numbers
+        
+    Returns:
+        tuple: (mean, std, min, max)
+    """
+    count = 0
+    running_mean = 0.0
+    m2 = 0.0
+    lowest = highest = values[0]
+    
+    for value in values:
+        count += 1
+        delta = value - running_mean
+        running_mean += delta / count
+        m2 += delta * (value - running_mean)
+        if value < lowest:
+            lowest = value
+        elif value > highest:
+            highest = value
+    
+    # Welford's running mean turns into nan once an infinite value is
+    # followed by a finite one, so it is only used for the variance
+    mean = sum(values) / count
+    std = (m2 / count) ** 0.5 if count > 1 else 0
+    return mean, std, lowest, highest
+
 
 class ResultsManager:
     """
@@ -34,6 +70,9 @@ class ResultsManager:
         self.test_name = test_name
         self.base_dir = os.path.join("results", test_name)
         
+        # Most recent summary written by save_results_summary
+        self.last_summary = None
+        
         # Ensure base directory exists
         os.makedirs(self.base_dir, exist_ok=True)
     
@@ -65,8 +104,7 @@ class ResultsManager:
                 'jobs': instance.jobs
             }
         
-        with open(filepath, 'w') as f:
-            json.dump(instances_data, f, indent=2, cls=NumpyEncoder)
+        write_json(instances_data, filepath)
         
         return filepath
     
@@ -81,17 +119,20 @@ class ResultsManager:
         Returns:
             Path to the saved file
         """
-        alg_dir = self.get_algorithm_dir(algorithm_name)
-        filepath = os.path.join(alg_dir, "solutions.json")
-        
         # Transform solutions to a dictionary indexed by seed
         solutions_dict = {}
         for i, solution in enumerate(solutions):
             seed = solution.get('seed', i)
             solutions_dict[str(seed)] = solution
         
-        with open(filepath, 'w') as f:
-            json.dump(solutions_dict, f, indent=2, cls=NumpyEncoder)
+        return self._write_solutions(algorithm_name, solutions_dict)
+    
+    def _write_solutions(self, algorithm_name, solutions_dict):
+        """Write an algorithm's solutions (keyed by seed) to solutions.json."""
+        alg_dir = self.get_algorithm_dir(algorithm_name)
+        filepath = os.path.join(alg_dir, "solutions.json")
+        
+        write_json(solutions_dict, filepath)
         
         return filepath
     
@@ -107,26 +148,37 @@ class ResultsManager:
         Returns:
             Path to the saved file
         """
+        # Create validation data
+        validations = [self._validation_row(instances[i], solution)
+                       for i, solution in enumerate(solutions)]
+        
+        return self._write_validations(algorithm_name, validations)
+    
+    @staticmethod
+    def _validation_row(instance, solution):
+        """Validate a solution and return its row for validations.csv."""
+        seed = solution.get('seed', instance.seed)
+        is_valid, error_msg = validate_solution(instance, solution)
+        makespan = solution.get('makespan', float('inf'))
+        
+        return {
+            'seed': seed,
+            'is_valid': is_valid,
+            'makespan': makespan,
+            'error_message': error_msg
+        }
+    
+    def _write_validations(self, algorithm_name, validations):
+        """Write an algorithm's validation rows to validations.csv."""
         alg_dir = self.get_algorithm_dir(algorithm_name)
         filepath = os.path.join(alg_dir, "validations.csv")
         
-        # Create validation data
-        validations = []
-        for i, (instance, solution) in enumerate(zip(instances, solutions)):
-            seed = solution.get('seed', instance.seed)
-            is_valid, error_msg = validate_solution(instance, solution)
-            makespan = solution.get('makespan', float('inf'))
-            
-            validations.append({
-                'seed': seed,
-                'is_valid': is_valid,
-                'makespan': makespan,
-                'error_message': error_msg
-            })
-        
         # Save to CSV
-        df = pd.DataFrame(validations)
-        df.to_csv(filepath, index=False)
+        with open(filepath, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['seed', 'is_valid', 'makespan', 'error_message'],
+                                    lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(validations)
         
         return filepath
     
@@ -160,21 +212,22 @@ class ResultsManager:
             makespans = [r['makespan'] for r in alg_results]
             times = [r['execution_time'] for r in alg_results]
             
-            # Calculate standard deviations
-            makespan_std = np.std(makespans) if len(makespans) > 1 else 0
-            time_std = np.std(times) if len(times) > 1 else 0
+            # Calculate means, standard deviations and ranges
+            avg_makespan, makespan_std, min_makespan, max_makespan = _summary_stats(makespans)
+            avg_time, time_std, _, _ = _summary_stats(times)
             
             results_data['algorithm_results'][alg_name] = {
-                'avg_makespan': sum(makespans) / len(makespans),
-                'min_makespan': min(makespans),
-                'max_makespan': max(makespans),
+                'avg_makespan': avg_makespan,
+                'min_makespan': min_makespan,
+                'max_makespan': max_makespan,
                 'makespan_std': makespan_std,
-                'avg_time': sum(times) / len(times),
+                'avg_time': avg_time,
                 'time_std': time_std
             }
         
-        with open(filepath, 'w') as f:
-            json.dump(results_data, f, indent=2, cls=NumpyEncoder)
+        # Kept indented since this file is meant to be read by people
+        write_json(results_data, filepath, indent=True)
+        self.last_summary = results_data
         
         return filepath
     
@@ -204,13 +257,21 @@ class ResultsManager:
         }
         
         for alg_name, alg_results in results.items():
-            # Add seed information to each solution if not present
+            # Build the solutions file and the validation rows in one pass
+            solutions_dict = {}
+            validations = []
             for i, solution in enumerate(alg_results):
+                instance = instances[i]
+                
+                # Add seed information to each solution if not present
                 if 'seed' not in solution:
-                    solution['seed'] = instances[i].seed
+                    solution['seed'] = instance.seed
+                
+                solutions_dict[str(solution['seed'])] = solution
+                validations.append(self._validation_row(instance, solution))
             
             # Save solutions and validations
-            saved_files[f"{alg_name}_solutions"] = self.save_solutions(alg_name, alg_results)
-            saved_files[f"{alg_name}_validations"] = self.save_validations(alg_name, instances, alg_results)
+            saved_files[f"{alg_name}_solutions"] = self._write_solutions(alg_name, solutions_dict)
+            saved_files[f"{alg_name}_validations"] = self._write_validations(alg_name, validations)
         
         return saved_files 
\ No newline at end of file
@@ -3,17 +3,24 @@ Utility functions for the FSJP solver.
 Includes functions for saving and loading problem instances and results.
 """
 
+import csv
 import json
 import os
-import pickle
-import numpy as np
-import pandas as pd
 from datetime import datetime
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class NumpyEncoder(json.JSONEncoder):
-    """JSON encoder that can handle NumPy types."""
+    """JSON encoder that can handle NumPy types (used when orjson is not installed)."""
     def default(self, obj):
+        # Imported lazily; after the first call this is a sys.modules lookup
+        import numpy as np
+        
         if isinstance(obj, np.integer):
             return int(obj)
         if isinstance(obj, np.floating):
@@ -23,6 +30,46 @@ class NumpyEncoder(json.JSONEncoder):
         return super(NumpyEncoder, self).default(obj)
 
 
+def _msgpack_default(obj):
+    """Convert NumPy types that msgpack cannot pack natively."""
+    import numpy as np
+    
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable")
+
+
+def write_json(data, filepath, indent=False):
+    """
+    Write data to a JSON file, using orjson when it is installed.
+    
+    orjson writes infinite and NaN floats (e.g. the makespan of a failed run)
+    as null, so whenever its output contains a null the data is written with
+    the standard json encoder instead, which keeps them as Infinity and NaN.
+    
+    Args:
+        data: The data to serialize (may contain NumPy types)
+        filepath: The file to write
+        indent: Whether to pretty-print with a 2-space indent
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        encoded = orjson.dumps(data, option=option)
+        if b'null' not in encoded:
+            with open(filepath, 'wb') as f:
+                f.write(encoded)
+            return
+    
+    with open(filepath, 'w') as f:
+        json.dump(data, f, indent=2 if indent else None, cls=NumpyEncoder)
+
+
 def save_instance(instance, filename=None):
     """
     Save an FSJP instance to a JSON file.
@@ -51,8 +98,7 @@ def save_instance(instance, filename=None):
     }
     
     # Save to file
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2, cls=NumpyEncoder)
+    write_json(data, filepath)
     
     return filepath
 
@@ -68,6 +114,8 @@ def load_instance(filepath, instance_class):
     Returns:
         An instance of the provided class
     """
+    import numpy as np
+    
     with open(filepath, 'r') as f:
         data = json.load(f)
     
@@ -75,10 +123,20 @@ def load_instance(filepath, instance_class):
     instance = instance_class(seed=data['seed'], 
                             num_jobs=data['num_jobs'])
     
+    # Restore eligible machines as int32 arrays, as generated
+    for job in data['jobs']:
+        for operation in job['operations']:
+            operation['eligible_machines'] = np.asarray(operation['eligible_machines'], dtype=np.int32)
+    
     # Override the generated jobs with the loaded ones
     instance.jobs = data['jobs']
     instance.num_machines = data['num_machines']
     
+    # Keep the cached operation counts in sync with the loaded jobs
+    instance.op_counts = np.fromiter((len(job['operations']) for job in instance.jobs),
+                                     dtype=np.int32, count=len(instance.jobs))
+    instance.total_ops = int(instance.op_counts.sum())
+    
     return instance
 
 
@@ -97,7 +155,7 @@ def save_results(results, config_info, filename=None):
     if filename is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         num_jobs = config_info.get('num_jobs', 'X')
-        filename = f"results_{num_jobs}j_{timestamp}.pkl"
+        filename = f"results_{num_jobs}j_{timestamp}.msgpack"
     
     # Create output directory if it doesn't exist
     os.makedirs("results", exist_ok=True)
@@ -110,9 +168,10 @@ def save_results(results, config_info, filename=None):
         'timestamp': datetime.now().isoformat()
     }
     
-    # Save to file
+    # Save to file (msgpack is only imported when saving)
+    import msgpack
     with open(filepath, 'wb') as f:
-        pickle.dump(data, f)
+        f.write(msgpack.packb(data, default=_msgpack_default, use_bin_type=True))
     
     return filepath
 
@@ -127,8 +186,9 @@ def load_results(filepath):
     Returns:
         A dictionary with the loaded data
     """
+    import msgpack
     with open(filepath, 'rb') as f:
-        data = pickle.load(f)
+        data = msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
     
     return data
 
@@ -154,7 +214,7 @@ def export_results_to_csv(results, config_info, filename=None):
     os.makedirs("results", exist_ok=True)
     filepath = os.path.join("results", filename)
     
-    # Prepare data for DataFrame
+    # Prepare rows for the CSV
     data = []
     for alg_name, alg_results in results.items():
         for i, result in enumerate(alg_results):
@@ -165,9 +225,12 @@ def export_results_to_csv(results, config_info, filename=None):
                 'execution_time': result['execution_time']
             })
     
-    # Create DataFrame and save to CSV
-    df = pd.DataFrame(data)
-    df.to_csv(filepath, index=False)
+    # Save to CSV
+    with open(filepath, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['algorithm', 'seed', 'makespan', 'execution_time'],
+                                lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(data)
     
     return filepath
 
@@ -197,36 +260,43 @@ def validate_solution(instance, solution):
         op_key = (op['job_id'], op['operation_id'])
         scheduled_ops.add(op_key)
     
-    total_required_ops = 0
-    for job_id, job in enumerate(instance.jobs):
-        total_required_ops += len(job['operations'])
-        for op_id in range(len(job['operations'])):
+    for job_id, num_ops in enumerate(instance.op_counts.tolist()):
+        for op_id in range(num_ops):
             if (job_id, op_id) not in scheduled_ops:
                 return False, f"Operation {op_id} of job {job_id} is not scheduled"
     
-    if len(scheduled_ops) != total_required_ops:
+    if len(scheduled_ops) != instance.total_ops:
         return False, "Schedule contains duplicate operations"
     
-    # 2. Check if operations of each job are scheduled in the correct order
-    for job_id in range(instance.num_jobs):
-        # Get all operations of this job in the schedule
-        job_ops = [op for op in schedule if op['job_id'] == job_id]
-        job_ops.sort(key=lambda x: x['operation_id'])
-        
-        for i in range(1, len(job_ops)):
-            if job_ops[i-1]['completion_time'] > job_ops[i]['start_time']:
-                return False, f"Operation {job_ops[i]['operation_id']} of job {job_id} starts before previous operation completes"
-    
-    # 3. Check if no machine processes multiple operations at the same time
-    for machine_id in range(instance.num_machines):
-        # Get all operations on this machine
-        machine_ops = [op for op in schedule if op['machine'] == machine_id]
-        
-        # Sort by start time
-        machine_ops.sort(key=lambda x: x['start_time'])
-        
-        for i in range(1, len(machine_ops)):
-            if machine_ops[i-1]['completion_time'] > machine_ops[i]['start_time']:
-                return False, f"Operations on machine {machine_id} overlap in time"
-    
-    return True, None 
\ No newline at end of file
+    if not schedule:
+        return True, None
+    
+    import numpy as np
+    
+    # Column arrays for the vectorized checks below
+    job_ids, op_ids, machines, start_times, completion_times = (
+        np.array(column) for column in zip(*map(
+            itemgetter('job_id', 'operation_id', 'machine', 'start_time', 'completion_time'),
+            schedule)))
+    
+    # 2. Check if operations of each job are scheduled in the correct order.
+    # Sort by (job, operation) and compare each operation with its predecessor
+    # in the same job.
+    order = np.lexsort((op_ids, job_ids))
+    same_job = job_ids[order][1:] == job_ids[order][:-1]
+    late = same_job & (completion_times[order][:-1] > start_times[order][1:])
+    if late.any():
+        i = order[np.flatnonzero(late)[0] + 1]
+        return False, f"Operation {op_ids[i]} of job {job_ids[i]} starts before previous operation completes"
+    
+    # 3. Check if no machine processes multiple operations at the same time.
+    # Sort by (machine, start time) and compare neighbours on the same machine.
+    on_machine = np.flatnonzero((machines >= 0) & (machines < instance.num_machines))
+    order = on_machine[np.lexsort((start_times[on_machine], machines[on_machine]))]
+    same_machine = machines[order][1:] == machines[order][:-1]
+    overlap = same_machine & (completion_times[order][:-1] > start_times[order][1:])
+    if overlap.any():
+        machine_id = machines[order[np.flatnonzero(overlap)[0] + 1]]
+        return False, f"Operations on machine {machine_id} overlap in time"
+    
+    return True, None
\ No newline at end of file
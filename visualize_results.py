@@ -5,10 +5,64 @@ Generates bar charts for algorithm runtime and makespan performance.
 
 import os
 import json
-import matplotlib.pyplot as plt
 import numpy as np
 import argparse
-from matplotlib.ticker import MaxNLocator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Per-algorithm summary fields the charts are drawn from
+_CHART_FIELDS = ('avg_time', 'time_std', 'avg_makespan', 'makespan_std')
+
+# matplotlib.pyplot, imported on first use by _get_pyplot()
+_plt = None
+
+# PNG settings for all charts: 150 DPI is plenty for bar charts, and fast
+# zlib compression keeps encoding cheap
+_SAVEFIG_KWARGS = {
+    'dpi': 150,
+    'pil_kwargs': {'compress_level': 1},
+    'metadata': {'Software': None},
+}
+
+
+def _get_pyplot():
+    """
+    Import matplotlib.pyplot on first use.
+    
+    Runs that exit before drawing a chart never pay for importing matplotlib.
+    The non-interactive Agg backend is selected before pyplot is imported,
+    since charts are only ever written to files.
+    
+    Returns:
+        The matplotlib.pyplot module
+    """
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        matplotlib.rcParams.update({
+            'figure.max_open_warning': 0,
+            'path.simplify': True,
+            'agg.path.chunksize': 10000,
+            # Shared chart styling, applied to every figure
+            'axes.grid': True,
+            'axes.grid.axis': 'y',
+            'grid.linestyle': '--',
+            'grid.alpha': 0.7,
+            'figure.autolayout': True,
+        })
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
+
 
 def load_results(results_file):
     """
@@ -20,120 +74,247 @@ def load_results(results_file):
     Returns:
         Dictionary containing the results data
     """
+    if orjson is not None:
+        with open(results_file, 'rb') as f:
+            data = f.read()
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Files written by the stdlib encoder may contain NaN/Infinity,
+            # which orjson rejects
+            return json.loads(data)
+    
     with open(results_file, 'r') as f:
         return json.load(f)
 
-def generate_runtime_chart(results_data, output_dir):
+def _trim_result(result):
+    """Keep only the summary fields used by the charts."""
+    return {key: result[key] for key in _CHART_FIELDS if key in result}
+
+def load_chart_data(results_file):
     """
-    Generate a bar chart showing average runtimes for each algorithm.
+    Load only the parts of a results.json file needed to draw the charts.
+    
+    With ijson installed, the algorithm_results object is streamed one
+    algorithm at a time, so the rest of the file is never built in memory.
+    Otherwise the whole file is loaded and then trimmed.
+    
+    Args:
+        results_file: Path to the results.json file
+        
+    Returns:
+        Dictionary of the form {'algorithm_results': {name: {field: value}}}
+    """
+    if ijson is not None:
+        try:
+            with open(results_file, 'rb') as f:
+                algorithm_results = {name: _trim_result(result) for name, result
+                                     in ijson.kvitems(f, 'algorithm_results', use_float=True)}
+            return {'algorithm_results': algorithm_results}
+        except ijson.JSONError:
+            # ijson rejects the NaN/Infinity the stdlib encoder may write
+            pass
+    
+    results_data = load_results(results_file)
+    algorithm_results = results_data.get('algorithm_results', {})
+    return {'algorithm_results': {name: _trim_result(result)
+                                  for name, result in algorithm_results.items()}}
+
+def _extract(algorithm_results, value_key, std_key):
+    """
+    Extract one metric for every algorithm.
+    
+    Args:
+        algorithm_results: Dictionary of algorithm name to summary statistics
+        value_key: Key of the averaged value (e.g. 'avg_time')
+        std_key: Key of its standard deviation (e.g. 'time_std')
+        
+    Returns:
+        tuple: (algorithms, values, stds) where algorithms is a list of names
+               and values and stds are NumPy arrays in the same order
+    """
+    algorithms, values, stds = [], [], []
+    for name, result in algorithm_results.items():
+        algorithms.append(name)
+        values.append(result[value_key])
+        stds.append(result.get(std_key, 0.0))
+    return algorithms, np.asarray(values, dtype=float), np.asarray(stds, dtype=float)
+
+def _draw_bar(ax, algorithms, values, stds, title, ylabel, label_fmt):
+    """
+    Draw a bar chart with error bars and value labels on the given axes.
+    
+    Args:
+        ax: Matplotlib axes to draw on
+        algorithms: Algorithm names (one bar each)
+        values: Bar heights
+        stds: Standard deviations shown as error bars
+        title: Chart title
+        ylabel: Y axis label
+        label_fmt: Format string for the value labels
+    """
+    bars = ax.bar(algorithms, values)
+    
+    # Error bars for all algorithms in a single call (NaN deviations are
+    # simply not drawn)
+    ax.errorbar(np.arange(len(algorithms)), values, yerr=stds, fmt='none',
+                ecolor='black', capsize=10, capthick=1)
+    
+    # Add data labels on top of the bars
+    ax.bar_label(bars, fmt=label_fmt, padding=3)
+    
+    # Add titles and labels
+    ax.set_title(title)
+    ax.set_xlabel('Algorithm')
+    ax.set_ylabel(ylabel)
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+
+def _draw_runtime_chart(ax, algorithm_results):
+    """Draw the average runtime chart on the given axes."""
+    algorithms, avg_times, time_stds = _extract(algorithm_results, 'avg_time', 'time_std')
+    _draw_bar(ax, algorithms, avg_times, time_stds,
+              'Runtime of Algorithms', 'Average Runtime (seconds)', '{:.4f}s')
+
+def _draw_makespan_chart(ax, algorithm_results):
+    """Draw the average makespan chart on the given axes."""
+    algorithms, avg_makespans, makespan_stds = _extract(algorithm_results, 'avg_makespan', 'makespan_std')
+    _draw_bar(ax, algorithms, avg_makespans, makespan_stds,
+              'Average Makespan of Algorithms', 'Average Makespan', '{:.2f}')
+
+def generate_charts(results_data, output_dir):
+    """
+    Generate the runtime and makespan charts.
+    
+    Both charts are drawn in turn on a single figure, which is cleared between
+    them, so figure setup happens once for the pair.
     
     Args:
         results_data: Dictionary containing the experiment results
-        output_dir: Directory to save the generated chart
+        output_dir: Directory to save the generated charts
     """
-    # Extract algorithm names and their runtime stats
     algorithm_results = results_data.get('algorithm_results', {})
-    algorithms = list(algorithm_results.keys())
     
-    if not algorithms:
+    if not algorithm_results:
         print("No algorithm results found")
         return
     
-    # Extract average runtime and standard deviation for each algorithm
-    avg_times = [algorithm_results[alg]['avg_time'] for alg in algorithms]
-    time_stds = [algorithm_results[alg].get('time_std', 0) for alg in algorithms]
+    plt = _get_pyplot()
+    fig = plt.figure(figsize=(10, 6))
     
-    # Create the bar chart
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(algorithms, avg_times, yerr=time_stds, capsize=10)
+    runtime_file = os.path.join(output_dir, 'runtime_comparison.png')
+    _generate_single_chart(_draw_runtime_chart, algorithm_results, runtime_file, fig)
+    print(f"Runtime chart saved to {runtime_file}")
     
-    # Add data labels on top of the bars
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.001,
-                f'{height:.4f}s',
-                ha='center', va='bottom', rotation=0)
+    makespan_file = os.path.join(output_dir, 'makespan_comparison.png')
+    _generate_single_chart(_draw_makespan_chart, algorithm_results, makespan_file, fig)
+    print(f"Makespan chart saved to {makespan_file}")
     
-    # Add titles and labels
-    plt.title('Runtime of Algorithms')
-    plt.xlabel('Algorithm')
-    plt.ylabel('Average Runtime (seconds)')
-    plt.xticks(rotation=45, ha='right')
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    
-    # Save the chart
-    output_file = os.path.join(output_dir, 'runtime_comparison.png')
-    plt.savefig(output_file, dpi=300)
-    plt.close()
+    plt.close(fig)
+
+def _generate_single_chart(draw_chart, algorithm_results, output_file, fig=None):
+    """
+    Draw one chart and save it, optionally reusing an existing figure.
     
-    print(f"Runtime chart saved to {output_file}")
+    Args:
+        draw_chart: Function drawing the chart, called as draw_chart(ax, algorithm_results)
+        algorithm_results: Dictionary of algorithm name to summary statistics
+        output_file: Path of the PNG file to write
+        fig: Figure to reuse; it is cleared before drawing and left open for
+             the caller to close. If omitted, a new figure is created and closed.
+    """
+    plt = _get_pyplot()
+    owns_figure = fig is None
+    if owns_figure:
+        fig = plt.figure(figsize=(10, 6))
+    else:
+        fig.clear()
+    
+    ax = fig.add_subplot()
+    draw_chart(ax, algorithm_results)
+    fig.savefig(output_file, **_SAVEFIG_KWARGS)
+    
+    if owns_figure:
+        plt.close(fig)
 
-def generate_makespan_chart(results_data, output_dir):
+def generate_runtime_chart(results_data, output_dir):
     """
-    Generate a bar chart showing average makespan for each algorithm.
+    Generate a bar chart showing average runtimes for each algorithm.
     
     Args:
         results_data: Dictionary containing the experiment results
         output_dir: Directory to save the generated chart
     """
-    # Extract algorithm names and their makespan stats
     algorithm_results = results_data.get('algorithm_results', {})
-    algorithms = list(algorithm_results.keys())
     
-    if not algorithms:
+    if not algorithm_results:
         print("No algorithm results found")
         return
     
-    # Extract average makespan and standard deviation for each algorithm
-    avg_makespans = [algorithm_results[alg]['avg_makespan'] for alg in algorithms]
-    makespan_stds = [algorithm_results[alg].get('makespan_std', 0) for alg in algorithms]
+    output_file = os.path.join(output_dir, 'runtime_comparison.png')
+    _generate_single_chart(_draw_runtime_chart, algorithm_results, output_file)
+    print(f"Runtime chart saved to {output_file}")
+
+def generate_makespan_chart(results_data, output_dir):
+    """
+    Generate a bar chart showing average makespan for each algorithm.
     
-    # Create the bar chart
-    plt.figure(figsize=(10, 6))
-    bars = plt.bar(algorithms, avg_makespans, yerr=makespan_stds, capsize=10)
+    Args:
+        results_data: Dictionary containing the experiment results
+        output_dir: Directory to save the generated chart
+    """
+    algorithm_results = results_data.get('algorithm_results', {})
     
-    # Add data labels on top of the bars
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.01 * max(avg_makespans),
-                f'{height:.2f}',
-                ha='center', va='bottom', rotation=0)
+    if not algorithm_results:
+        print("No algorithm results found")
+        return
     
-    # Add titles and labels
-    plt.title('Average Makespan of Algorithms')
-    plt.xlabel('Algorithm')
-    plt.ylabel('Average Makespan')
-    plt.xticks(rotation=45, ha='right')
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    
-    # Save the chart
     output_file = os.path.join(output_dir, 'makespan_comparison.png')
-    plt.savefig(output_file, dpi=300)
-    plt.close()
-    
+    _generate_single_chart(_draw_makespan_chart, algorithm_results, output_file)
     print(f"Makespan chart saved to {output_file}")
 
+def _charts_up_to_date(results_file, output_dir):
+    """
+    Check whether both charts exist and are newer than the results file.
+    
+    Args:
+        results_file: Path to the results.json file the charts are built from
+        output_dir: Directory holding the generated charts
+        
+    Returns:
+        bool: True if neither chart needs to be regenerated
+    """
+    src_mtime = os.path.getmtime(results_file)
+    for chart_name in ('runtime_comparison.png', 'makespan_comparison.png'):
+        try:
+            if os.path.getmtime(os.path.join(output_dir, chart_name)) < src_mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
 def main():
     """Main function to generate visualization charts."""
     parser = argparse.ArgumentParser(description='Generate visualization charts for FSJP experiment results')
     parser.add_argument('--test-name', type=str, default=None, help='Name of the test to visualize')
     parser.add_argument('--results-dir', type=str, default='results', help='Directory containing results')
+    parser.add_argument('--force', action='store_true', help='Regenerate charts even if they are up to date')
     args = parser.parse_args()
     
     # If test name not provided, use the most recent test
     if args.test_name is None:
-        test_dirs = [d for d in os.listdir(args.results_dir) 
-                    if os.path.isdir(os.path.join(args.results_dir, d))]
+        # scandir entries cache their type and stat, so this needs no extra
+        # per-directory lookups
+        with os.scandir(args.results_dir) as entries:
+            latest = max((entry for entry in entries if entry.is_dir()),
+                         key=lambda entry: entry.stat().st_mtime, default=None)
         
-        if not test_dirs:
+        if latest is None:
             print(f"No test directories found in {args.results_dir}")
             return
         
-        # Sort by modification time (most recent first)
-        test_dirs.sort(key=lambda d: os.path.getmtime(os.path.join(args.results_dir, d)), reverse=True)
-        test_name = test_dirs[0]
+        test_name = latest.name
         print(f"Using most recent test: {test_name}")
     else:
         test_name = args.test_name
@@ -145,16 +326,21 @@ def main():
         print(f"Results file not found: {results_file}")
         return
     
-    # Load results data
-    results_data = load_results(results_file)
+    output_dir = os.path.join(args.results_dir, test_name, 'charts')
+    
+    # Skip everything if the charts were generated after the last results
+    if not args.force and _charts_up_to_date(results_file, output_dir):
+        print(f"Charts in {output_dir} are up to date (use --force to regenerate)")
+        return
+    
+    # Load the fields the charts need
+    results_data = load_chart_data(results_file)
     
     # Create output directory for charts
-    output_dir = os.path.join(args.results_dir, test_name, 'charts')
     os.makedirs(output_dir, exist_ok=True)
     
     # Generate charts
-    generate_runtime_chart(results_data, output_dir)
-    generate_makespan_chart(results_data, output_dir)
+    generate_charts(results_data, output_dir)
     
     print(f"Charts generated in {output_dir}")
 